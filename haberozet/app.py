@@ -5,11 +5,16 @@ Kullanıcının haber URL'si girip TF-IDF, TextRank veya Abstractive
 yöntemiyle özet oluşturmasını sağlayan web uygulaması.
 """
 
+import logging
+import threading
+
 import streamlit as st
 
 from preprocessor import setup_nltk
 from scraper import fetch_article
-from summarizer import summarize
+from summarizer import load_abstractive_model, summarize
+
+logger = logging.getLogger(__name__)
 
 # ── NLTK verilerini bir kez indir ──────────────────────────────────
 @st.cache_resource
@@ -19,6 +24,27 @@ def _init_nltk() -> None:
 
 _init_nltk()
 
+
+def _warm_abstractive() -> None:
+    """Abstractive modeli arka planda önbelleğe yükler."""
+    try:
+        load_abstractive_model()
+    except Exception as exc:
+        # Hata önbelleğe alınmaz; özetleme sırasında yükleme yeniden denenir
+        logger.error("Model ön yüklemesi başarısız: %s", exc)
+
+
+@st.cache_resource
+def _prewarm_abstractive() -> threading.Thread:
+    """Model yüklemesini süreç başına bir kez arka plan thread'inde başlatır.
+
+    Böylece ~2 GB'lık model, kullanıcı URL'yi yapıştırırken ve haber
+    çekilirken yüklenir.
+    """
+    thread = threading.Thread(target=_warm_abstractive, daemon=True)
+    thread.start()
+    return thread
+
 # ── Sayfa Ayarları ─────────────────────────────────────────────────
 st.set_page_config(
     page_title="HaberÖzet",
@@ -47,6 +73,9 @@ with st.sidebar:
     }
     method_key = method_map[method]
 
+    if method_key == "abstractive":
+        _prewarm_abstractive()
+
     # Abstractive yöntemde cümle sayısı slider'ı gereksiz
     if method_key != "abstractive":
         n_sentences = st.slider(
@@ -58,6 +87,19 @@ with st.sidebar:
     else:
         n_sentences = 3  # extractive fallback değeri, abstractive'de kullanılmaz
 
+    # Beam genişliği yalnızca abstractive yöntemde anlamlı
+    num_beams = 2
+    if method_key == "abstractive":
+        with st.expander("🔧 Gelişmiş Ayarlar"):
+            num_beams = st.slider(
+                "Beam Genişliği",
+                min_value=1,
+                max_value=4,
+                value=2,
+                help="Daha geniş beam biraz daha iyi özet üretebilir ancak "
+                "üretim süresi beam sayısıyla doğru orantılı artar.",
+            )
+
     st.divider()
     st.subheader("ℹ️ Yöntem Bilgisi")
     st.info(
@@ -91,9 +133,11 @@ def cached_fetch(url: str) -> dict:
 
 
 @st.cache_data(show_spinner=False)
-def cached_summarize(text: str, n: int, method: str, title: str = "") -> dict:
+def cached_summarize(
+    text: str, n: int, method: str, title: str = "", num_beams: int = 2
+) -> dict:
     """Aynı metin/parametre kombinasyonu için sonucu önbelleğe alır."""
-    return summarize(text, n=n, method=method, title=title)
+    return summarize(text, n=n, method=method, title=title, num_beams=num_beams)
 
 
 # ── Ana Alan ───────────────────────────────────────────────────────
@@ -125,6 +169,7 @@ if summarize_btn:
                     result = cached_summarize(
                         article["text"], n_sentences, method_key,
                         title=article["title"],
+                        num_beams=num_beams,
                     )
 
                 if result["error"]:
@@ -1,17 +1,24 @@
 # -*- coding: utf-8 -*-
 """NLP ön işleme modülü.
 
-NLTK tabanlı cümle tokenizasyonu, stop-words filtreleme ve
+blingfire / NLTK tabanlı cümle tokenizasyonu, stop-words filtreleme ve
 metin temizleme fonksiyonlarını içerir. Türkçe dil desteği sağlar.
 """
 
 import re
+import string
 import logging
+from functools import lru_cache
 
 import nltk
 from nltk.tokenize import sent_tokenize
 from nltk.corpus import stopwords
 
+try:
+    import blingfire
+except (ImportError, OSError):  # kurulu değil / platform için native kütüphane yok
+    blingfire = None  # NLTK Punkt kullanılır
+
 logger = logging.getLogger(__name__)
 
 # ── Metadata / gürültü kalıpları ───────────────────────────────────
@@ -57,6 +64,29 @@ _NOISE_PATTERNS: list[re.Pattern] = [
     re.compile(r"^(©|Copyright|Tüm\s+hakları)", re.IGNORECASE),
 ]
 
+# preprocess_sentence için noktalama + rakam silme tablosu (tek C döngüsü).
+# "_" \w kapsamında olduğu için korunur; U+0307, "İ".lower() çıktısındaki
+# birleşik noktadır ("i̇stanbul" → "istanbul"). Boşluk sayılmayan ASCII
+# kontrol karakterleri de silinir; ASCII metinde _RESIDUAL_RE atlandığı için
+# eski [^\w\s] davranışı bu şekilde korunur.
+_ASCII_CONTROL = "".join(map(chr, [*range(0x00, 0x09), *range(0x0E, 0x1C), 0x7F]))
+_STRIP_TABLE = str.maketrans(
+    dict.fromkeys(
+        string.punctuation.replace("_", "")
+        + string.digits
+        + "«»“”‘’…—–\u0307"
+        + _ASCII_CONTROL
+    )
+)
+# Tablonun kapsamadığı diğer Unicode sembol / rakamlar (₺, €, •, · …)
+_RESIDUAL_RE = re.compile(r"[^\w\s]|\d")
+
+# Tüm kalıplar tek bir alternation olarak derlenir; her satır bir kez taranır
+_NOISE_RE = re.compile(
+    "|".join(f"(?:{pat.pattern})" for pat in _NOISE_PATTERNS),
+    re.IGNORECASE,
+)
+
 
 def clean_article_text(text: str, title: str = "") -> str:
     """Haber metninden metadata / gürültü satırlarını temizler.
@@ -73,7 +103,7 @@ def clean_article_text(text: str, title: str = "") -> str:
         Temizlenmiş makale metni.
     """
     # Başlık karşılaştırması için normalize edilmiş versiyon
-    norm_title = re.sub(r"\s+", " ", title.strip().lower()) if title else ""
+    norm_title = " ".join(title.lower().split())
 
     cleaned_lines: list[str] = []
     for line in text.split("\n"):
@@ -85,13 +115,13 @@ def clean_article_text(text: str, title: str = "") -> str:
             continue
 
         # Bilinen gürültü kalıplarına uyan satırları at
-        if any(pat.search(stripped) for pat in _NOISE_PATTERNS):
+        if _NOISE_RE.search(stripped):
             continue
 
         # Başlık ile aynı veya çok benzer satırları at
         if norm_title:
-            norm_line = re.sub(r"\s+", " ", stripped.lower())
-            if norm_line == norm_title or norm_title in norm_line or norm_line in norm_title:
+            norm_line = " ".join(stripped.lower().split())
+            if norm_title in norm_line or norm_line in norm_title:
                 continue
 
         cleaned_lines.append(line)
@@ -110,20 +140,34 @@ def setup_nltk() -> None:
         nltk.download(package, quiet=True)
 
 
+@lru_cache(maxsize=32)
+def _split_sentences(text: str) -> tuple[str, ...]:
+    """``tokenize_sentences`` için önbellekli, değiştirilemez sonuç üretir."""
+    if blingfire is not None:
+        raw_sentences = blingfire.text_to_sentences(text).split("\n")
+    else:
+        raw_sentences = sent_tokenize(text, language="turkish")
+    return tuple(s.strip() for s in raw_sentences if len(s.strip()) >= 20)
+
+
 def tokenize_sentences(text: str) -> list[str]:
     """Metni cümlelere böler ve kısa cümleleri filtreler.
 
+    Bölme işlemi blingfire'ın DFA tabanlı segmentleyicisiyle yapılır;
+    blingfire kurulu değilse NLTK Punkt (Türkçe) kullanılır. Aynı metin
+    için sonuç önbellekten gelir (ör. yalnızca cümle sayısı
+    değiştiğinde metin yeniden bölünmez).
+
     Args:
         text: Cümlelere bölünecek ham metin.
 
     Returns:
         20 karakterden uzun cümlelerin listesi.
     """
-    raw_sentences = sent_tokenize(text, language="turkish")
-    return [s.strip() for s in raw_sentences if len(s.strip()) >= 20]
+    return list(_split_sentences(text))
 
 
-def preprocess_sentence(sentence: str, stop_words: set) -> str:
+def preprocess_sentence(sentence: str, stop_words: frozenset) -> str:
     """Cümleyi NLP için ön işlemden geçirir.
 
     İşlemler:
@@ -138,22 +182,22 @@ def preprocess_sentence(sentence: str, stop_words: set) -> str:
     Returns:
         Temizlenmiş ve filtrelenmiş cümle metni.
     """
-    sentence = sentence.lower()
-    sentence = re.sub(r"[^\w\s]", "", sentence)
-    sentence = re.sub(r"\d+", "", sentence)
-    words = sentence.split()
-    words = [w for w in words if w not in stop_words]
-    return " ".join(words)
+    sentence = sentence.lower().translate(_STRIP_TABLE)
+    if not sentence.isascii():
+        sentence = _RESIDUAL_RE.sub("", sentence)
+    return " ".join(w for w in sentence.split() if w not in stop_words)
 
 
-def get_turkish_stopwords() -> set:
+@lru_cache(maxsize=1)
+def get_turkish_stopwords() -> frozenset:
     """Türkçe ve İngilizce stop-words setini döndürür.
 
     NLTK İngilizce stop-words listesine ek olarak 50'den fazla
-    Türkçe stop-word içerir.
+    Türkçe stop-word içerir. Sonuç ilk çağrıda hesaplanıp önbelleğe
+    alınır; NLTK korpusu her özetlemede yeniden okunmaz.
 
     Returns:
-        Birleştirilmiş stop-words seti.
+        Birleştirilmiş, değiştirilemez stop-words seti.
     """
     try:
         english_sw = set(stopwords.words("english"))
@@ -175,7 +219,7 @@ def get_turkish_stopwords() -> set:
         "var", "yok", "değil", "bile", "sadece", "artık", "henüz",
     }
 
-    return english_sw | turkish_sw
+    return frozenset(english_sw | turkish_sw)
 
 
 if __name__ == "__main__":
@@ -1,30 +1,50 @@
 # -*- coding: utf-8 -*-
 """Haber çekme modülü.
 
-newspaper3k kütüphanesi kullanarak verilen URL'den haber metnini çeker,
-parse eder ve temizlenmiş veriyi dict olarak döndürür.
+Verilen URL'den HTML'i kalıcı bir httpx bağlantı havuzuyla indirir,
+newspaper3k ile parse eder ve temizlenmiş veriyi dict olarak döndürür.
 """
 
+import asyncio
 import logging
+
+import httpx
 from newspaper import Article
 
 from preprocessor import clean_article_text
 
 logger = logging.getLogger(__name__)
 
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+}
+_TIMEOUT = 10
+_MAX_CONCURRENT_FETCHES = 5
+
+# Bağlantı havuzu istekler arasında paylaşılır (TCP/TLS el sıkışması tekrarlanmaz)
+_HTTP = httpx.Client(
+    http2=True,
+    timeout=_TIMEOUT,
+    headers=_HEADERS,
+    follow_redirects=True,
+)
 
-def fetch_article(url: str) -> dict:
-    """Verilen URL'den haber makalesini çeker ve parse eder.
+
+def _parse_article(url: str, html: bytes) -> dict:
+    """Önceden indirilmiş HTML'i newspaper3k ile parse eder.
+
+    HTML ham byte olarak verilir; karakter kodlaması (ör. windows-1254,
+    ISO-8859-9) newspaper3k'nın kendi tespitiyle çözülür.
 
     Args:
         url: Haber makalesinin URL'si.
+        html: Sayfanın ham HTML içeriği.
 
     Returns:
-        Şu anahtarları içeren dict:
-            - title (str): Haber başlığı
-            - text (str): Temiz haber metni
-            - url (str): Orijinal URL
-            - error (str | None): Hata varsa mesaj, yoksa None
+        ``fetch_article`` ile aynı yapıda dict.
     """
     result: dict = {
         "title": "",
@@ -33,30 +53,96 @@ def fetch_article(url: str) -> dict:
         "error": None,
     }
 
-    try:
-        article = Article(url, language="tr")
-        article.download()
-        article.parse()
-
-        result["title"] = article.title or ""
-        result["text"] = clean_article_text(article.text or "", title=result["title"])
-        result["url"] = url
+    article = Article(url, language="tr")
+    article.download(input_html=html)
+    article.parse()
 
-        if len(result["text"]) < 100:
-            result["error"] = "Yeterli içerik bulunamadı"
-            result["title"] = ""
-            result["text"] = ""
-            return result
+    result["title"] = article.title or ""
+    result["text"] = clean_article_text(article.text or "", title=result["title"])
 
-    except Exception as exc:
-        logger.error("Makale çekilirken hata oluştu: %s", exc)
-        result["error"] = f"Haber çekilemedi: {exc}"
+    if len(result["text"]) < 100:
+        result["error"] = "Yeterli içerik bulunamadı"
         result["title"] = ""
         result["text"] = ""
 
     return result
 
 
+def _error_result(url: str, exc: Exception) -> dict:
+    """Hata durumunda döndürülecek boş sonucu oluşturur."""
+    logger.error("Makale çekilirken hata oluştu: %s", exc)
+    return {
+        "title": "",
+        "text": "",
+        "url": url,
+        "error": f"Haber çekilemedi: {exc}",
+    }
+
+
+def fetch_article(url: str) -> dict:
+    """Verilen URL'den haber makalesini çeker ve parse eder.
+
+    HTML, modül genelinde paylaşılan ``httpx.Client`` ile indirilir;
+    newspaper3k yalnızca parse için kullanılır.
+
+    Args:
+        url: Haber makalesinin URL'si.
+
+    Returns:
+        Şu anahtarları içeren dict:
+            - title (str): Haber başlığı
+            - text (str): Temiz haber metni
+            - url (str): Orijinal URL
+            - error (str | None): Hata varsa mesaj, yoksa None
+    """
+    try:
+        response = _HTTP.get(url)
+        response.raise_for_status()
+        return _parse_article(url, response.content)
+    except Exception as exc:
+        return _error_result(url, exc)
+
+
+async def _fetch_one(
+    client: httpx.AsyncClient,
+    url: str,
+    semaphore: asyncio.Semaphore,
+) -> dict:
+    """Tek bir URL'yi eşzamanlılık sınırı altında çeker ve parse eder."""
+    try:
+        async with semaphore:
+            response = await client.get(url)
+        response.raise_for_status()
+        # Parse CPU-bound; event loop'u bloklamamak için thread'de çalışır
+        return await asyncio.to_thread(_parse_article, url, response.content)
+    except Exception as exc:
+        return _error_result(url, exc)
+
+
+async def fetch_articles(urls: list[str]) -> list[dict]:
+    """Birden fazla URL'yi eşzamanlı olarak çeker.
+
+    En fazla ``_MAX_CONCURRENT_FETCHES`` istek aynı anda çalışır.
+
+    Args:
+        urls: Haber makalelerinin URL listesi.
+
+    Returns:
+        Her URL için ``fetch_article`` ile aynı yapıda dict listesi
+        (girdi sırasıyla).
+    """
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_FETCHES)
+    async with httpx.AsyncClient(
+        http2=True,
+        timeout=_TIMEOUT,
+        headers=_HEADERS,
+        follow_redirects=True,
+    ) as client:
+        return await asyncio.gather(
+            *(_fetch_one(client, url, semaphore) for url in urls)
+        )
+
+
 if __name__ == "__main__":
     test_url = "https://www.bbc.com/turkce"
     data = fetch_article(test_url)
@@ -7,28 +7,87 @@
   - Abstractive: mT5 tabanlı Türkçe model ile kendi cümlesini üretir
 """
 
+import functools
 import logging
+import os
 
 import numpy as np
-import networkx as nx
+import torch
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 
+try:
+    import streamlit as st
+except ImportError:  # Modül Streamlit dışında da kullanılabilir
+    st = None
+
+try:
+    import ctranslate2
+except ImportError:  # CTranslate2 opsiyoneldir; yoksa HF generate kullanılır
+    ctranslate2 = None
+
 from preprocessor import setup_nltk, tokenize_sentences, preprocess_sentence, get_turkish_stopwords
 
 logger = logging.getLogger(__name__)
 
 # ── Abstractive model sabitleri ────────────────────────────────────
 _MODEL_NAME = "yeniguno/turkish-abstractive-summary-mt5"
-_tokenizer = None
-_model = None
 _MAX_INPUT_TOKENS = 512
+# ct2-transformers-converter ile dönüştürülmüş model dizini (varsa kullanılır)
+_CT2_MODEL_DIR = os.environ.get(
+    "HABEROZET_CT2_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "mt5-ct2"),
+)
+# CPU'da encoder/decoder Linear katmanlarını dinamik INT8'e çevirir
+# (opsiyonel, varsayılan kapalı)
+_CPU_INT8 = os.environ.get("HABEROZET_CPU_INT8", "") == "1"
+# CUDA'da forward'ı torch.compile ile derler (opsiyonel, varsayılan kapalı)
+_TORCH_COMPILE = os.environ.get("HABEROZET_TORCH_COMPILE", "") == "1"
+
+
+def _row_sums(csr_matrix) -> np.ndarray:
+    """CSR matrisin satır toplamlarını ``np.matrix`` ara nesnesi olmadan hesaplar.
+
+    Boş satırlar ``reduceat`` ile yanlış toplanacağı için atlanır ve 0 kalır.
+    """
+    data, indptr = csr_matrix.data, csr_matrix.indptr
+    sums = np.zeros(csr_matrix.shape[0], dtype=data.dtype)
+    non_empty = np.diff(indptr) > 0
+    if non_empty.any():
+        sums[non_empty] = np.add.reduceat(data, indptr[:-1][non_empty])
+    return sums
+
+
+def _top_n_indices(scores: np.ndarray, n: int) -> list[int]:
+    """En yüksek skorlu n indeksi orijinal sırada döndürür.
+
+    ``argpartition`` ile n'inci en yüksek skor O(N)'de bulunur; bu eşiğe
+    eşit veya üstündeki adaylar (sınırdaki eşitlikler dahil) kararlı
+    sıralanır. Böylece eşit skorlarda metinde önce gelen cümle seçilir.
+    """
+    if n <= 0:
+        return []
+    if n >= len(scores):
+        return list(range(len(scores)))
+    threshold = scores[np.argpartition(-scores, n - 1)[n - 1]]
+    candidates = np.flatnonzero(scores >= threshold)
+    top = candidates[np.argsort(-scores[candidates], kind="stable")[:n]]
+    return sorted(top.tolist())
+
+
+def _fit_tfidf(clean_sentences: list[str]):
+    """Ön işlenmiş cümleler üzerinde float32 TF-IDF matrisi (CSR) üretir.
+
+    TF-IDF ve TextRank aynı matrisi kullandığı için ``summarize`` içinde
+    bir kez hesaplanıp ilgili yönteme aktarılır.
+    """
+    vectorizer = TfidfVectorizer(dtype=np.float32, token_pattern=r"(?u)\b\w+\b")
+    return vectorizer.fit_transform(clean_sentences)
 
 
 def tfidf_summarize(
     sentences: list[str],
-    clean_sentences: list[str],
+    tfidf_matrix,
     n: int,
 ) -> list[str]:
     """TF-IDF skorlarına göre en önemli cümleleri seçer.
@@ -39,78 +98,275 @@ def tfidf_summarize(
 
     Args:
         sentences: Orijinal (ham) cümle listesi.
-        clean_sentences: Ön işlemden geçmiş cümle listesi.
+        tfidf_matrix: Cümlelerin TF-IDF matrisi (satır başına bir cümle).
         n: Seçilecek özet cümle sayısı.
 
     Returns:
         Seçilen orijinal cümlelerin listesi (orijinal sırada).
     """
-    vectorizer = TfidfVectorizer()
-    tfidf_matrix = vectorizer.fit_transform(clean_sentences)
+    sentence_scores = _row_sums(tfidf_matrix)
 
-    sentence_scores = np.asarray(tfidf_matrix.sum(axis=1)).flatten()
-
-    ranked_indices = sentence_scores.argsort()[::-1][:n]
-    selected_indices = sorted(ranked_indices)
+    selected_indices = _top_n_indices(sentence_scores, n)
 
     return [sentences[i] for i in selected_indices]
 
 
+def _pagerank(
+    sim_matrix,
+    damping: float = 0.85,
+    max_iter: int = 100,
+    tol: float = 1e-6,
+) -> np.ndarray:
+    """Benzerlik matrisi üzerinde ağırlıklı PageRank (power iteration).
+
+    Satır-normalize geçiş matrisi açıkça kurulmaz; her adımda
+    ``sim.T @ (r / satır_toplamı)`` hesaplanır. Çıkış ağırlığı olmayan
+    (dangling) düğümlerin skoru tüm düğümlere eşit dağıtılır.
+
+    Args:
+        sim_matrix: N×N simetrik benzerlik matrisi.
+        damping: Sönümleme katsayısı.
+        max_iter: Maksimum iterasyon sayısı.
+        tol: L1 yakınsama eşiği.
+
+    Returns:
+        N uzunluğunda skor vektörü (toplamı 1).
+    """
+    n = sim_matrix.shape[0]
+    out_weight = np.asarray(sim_matrix.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inv_weight = np.divide(
+        1.0, out_weight, out=np.zeros_like(out_weight), where=~dangling
+    )
+
+    r = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        r_prev = r
+        spread = sim_matrix.T @ (r_prev * inv_weight) + r_prev[dangling].sum() / n
+        r = (1.0 - damping) / n + damping * np.asarray(spread).ravel()
+        if np.abs(r - r_prev).sum() < tol:
+            break
+    return r
+
+
 def textrank_summarize(
     sentences: list[str],
-    clean_sentences: list[str],
+    tfidf_matrix,
     n: int,
 ) -> list[str]:
     """TextRank algoritması ile en önemli cümleleri seçer.
 
-    TF-IDF vektörleriyle cümle benzerlik matrisi oluşturur, networkx
-    ile graf kurar ve PageRank ile cümle skorlarını hesaplar.
+    TF-IDF vektörleriyle cümle benzerlik matrisi oluşturur ve NumPy
+    üzerinde PageRank ile cümle skorlarını hesaplar. Cümlelerin kendileriyle
+    benzerliği (köşegen) grafa dahil edilmez.
 
     Args:
         sentences: Orijinal (ham) cümle listesi.
-        clean_sentences: Ön işlemden geçmiş cümle listesi.
+        tfidf_matrix: Cümlelerin TF-IDF matrisi (satır başına bir cümle).
         n: Seçilecek özet cümle sayısı.
 
     Returns:
         Seçilen orijinal cümlelerin listesi (orijinal sırada).
     """
-    vectorizer = TfidfVectorizer()
-    tfidf_matrix = vectorizer.fit_transform(clean_sentences)
+    # TfidfVectorizer satırları zaten L2-normalize ettiği için kosinüs
+    # benzerliği tek bir yoğun float32 GEMM'dir; öz-döngüler (köşegen) sıfırlanır
+    dense = tfidf_matrix.toarray()
+    sim_matrix = dense @ dense.T
+    np.fill_diagonal(sim_matrix, 0.0)
 
-    sim_matrix = cosine_similarity(tfidf_matrix)
+    scores = _pagerank(sim_matrix)
 
-    graph = nx.from_numpy_array(sim_matrix)
+    selected_indices = _top_n_indices(scores, n)
 
-    scores = nx.pagerank(graph, max_iter=200)
+    return [sentences[i] for i in selected_indices]
 
-    ranked_indices = sorted(scores, key=scores.get, reverse=True)[:n]
-    selected_indices = sorted(ranked_indices)
 
-    return [sentences[i] for i in selected_indices]
+def _load_hf_model():
+    """mT5 modelini cihaza uygun hassasiyetle yükler.
+
+    - CUDA, Ampere+ (compute capability >= 8, yerel bf16): bfloat16 ağırlıklar.
+    - Diğer GPU'lar (T4, V100 …): bitsandbytes varsa LLM.int8(), yoksa FP32.
+      (T5 ailesi float16'da taşma/NaN ürettiği için fp16 kullanılmaz.)
+    - CUDA'da ``HABEROZET_TORCH_COMPILE=1`` ise forward ayrıca
+      ``torch.compile`` ile derlenir.
+    - CPU: FP32. ``HABEROZET_CPU_INT8=1`` ise encoder ve decoder'daki
+      Linear katmanlar dinamik INT8 kuantizasyona çevrilir; 250k
+      kelimelik ``lm_head`` projeksiyonu FP32 kalır.
+
+    Returns:
+        Çıkarım moduna alınmış model.
+    """
+    if not torch.cuda.is_available():
+        model = AutoModelForSeq2SeqLM.from_pretrained(_MODEL_NAME).eval()
+        if not _CPU_INT8:
+            return model
+        # Modül adlarıyla sınırlandırılır; lm_head kuantize edilmez
+        return torch.ao.quantization.quantize_dynamic(
+            model, {"encoder", "decoder"}, dtype=torch.qint8
+        )
+
+    # is_bf16_supported() eski GPU'larda emülasyon nedeniyle True dönebilir
+    if torch.cuda.get_device_capability()[0] >= 8:
+        dtype = torch.bfloat16
+    else:
+        try:
+            import bitsandbytes  # noqa: F401
+            from transformers import BitsAndBytesConfig
+        except ImportError:
+            dtype = torch.float32
+        else:
+            model = AutoModelForSeq2SeqLM.from_pretrained(
+                _MODEL_NAME,
+                quantization_config=BitsAndBytesConfig(load_in_8bit=True),
+                device_map="auto",
+            )
+            return model.eval()
+
+    model = AutoModelForSeq2SeqLM.from_pretrained(_MODEL_NAME, torch_dtype=dtype)
+    model = model.to("cuda").eval()
+    if _TORCH_COMPILE:
+        # generate() modül yerine forward'ı çağırdığı için forward derlenir.
+        # Dinamik KV cache ile her adımda uzunluk değiştiğinden CUDA graph
+        # ("reduce-overhead") yerine varsayılan mod + dinamik şekiller kullanılır.
+        model.forward = torch.compile(model.forward, dynamic=True)
+    return model
+
+
+def _load_ct2_translator():
+    """CTranslate2 ile dönüştürülmüş modeli yükler.
+
+    Model dizini yoksa veya ctranslate2 kurulu değilse None döner.
+    Dönüştürme bir kez, kurulum aşamasında yapılır::
+
+        ct2-transformers-converter --model yeniguno/turkish-abstractive-summary-mt5 \\
+            --quantization int8 --output_dir models/mt5-ct2
+
+    Returns:
+        ``ctranslate2.Translator`` veya None.
+    """
+    if ctranslate2 is None or not os.path.isdir(_CT2_MODEL_DIR):
+        return None
+    # device="auto": GPU varsa CUDA, yoksa CPU; "int8" her iki cihazda da geçerli
+    return ctranslate2.Translator(
+        _CT2_MODEL_DIR,
+        device="auto",
+        compute_type="int8",
+        intra_threads=os.cpu_count() or 0,
+    )
+
+
+def _cache_resource(func):
+    """Streamlit varsa ``st.cache_resource``, yoksa ``lru_cache`` uygular.
+
+    Böylece model Streamlit rerun'ları ve oturumlar arasında tek bir
+    kopya olarak bellekte kalır.
+    """
+    if st is None:
+        return functools.lru_cache(maxsize=1)(func)
+    return st.cache_resource(show_spinner=False)(func)
+
+
+@_cache_resource
+def _cached_abstractive():
+    """Tokenizer ve modeli bir kez yükleyip önbellekte tutar."""
+    logger.info("Abstractive model yükleniyor: %s", _MODEL_NAME)
+    tokenizer = AutoTokenizer.from_pretrained(_MODEL_NAME)
+    model = _load_ct2_translator()
+    if model is not None:
+        logger.info("CTranslate2 modeli kullanılıyor: %s", _CT2_MODEL_DIR)
+    else:
+        model = _load_hf_model()
+    logger.info("Model başarıyla yüklendi.")
+    return tokenizer, model
 
 
 def load_abstractive_model():
     """mT5 modelini ve tokenizer'ı yükler (lazy loading).
 
     İlk çağrıda model indirilir/yüklenir, sonraki çağrılarda
-    cache'ten döndürülür.
+    cache'ten döndürülür. CTranslate2 modeli mevcutsa HF modeli
+    yerine o kullanılır; tokenizer her iki durumda da HF'ten gelir.
 
     Returns:
-        (tokenizer, model) tuple.
+        (tokenizer, model) tuple. model, ``ctranslate2.Translator``
+        veya HF ``AutoModelForSeq2SeqLM`` olabilir.
     """
-    global _tokenizer, _model
-    if _tokenizer is None or _model is None:
-        logger.info("Abstractive model yükleniyor: %s", _MODEL_NAME)
-        _tokenizer = AutoTokenizer.from_pretrained(_MODEL_NAME)
-        _model = AutoModelForSeq2SeqLM.from_pretrained(_MODEL_NAME)
-        logger.info("Model başarıyla yüklendi.")
-    return _tokenizer, _model
+    return _cached_abstractive()
+
+
+def _generate_ct2(
+    tokenizer,
+    translator,
+    chunks_text: list[str],
+    max_length: int,
+    min_length: int,
+    num_beams: int,
+) -> list[str]:
+    """Parçaları tek bir ``translate_batch`` çağrısıyla özetler."""
+    source_tokens = [
+        tokenizer.convert_ids_to_tokens(
+            tokenizer.encode(chunk, max_length=_MAX_INPUT_TOKENS, truncation=True)
+        )
+        for chunk in chunks_text
+    ]
+    results = translator.translate_batch(
+        source_tokens,
+        beam_size=num_beams,
+        max_decoding_length=max_length,
+        min_decoding_length=min_length,
+        length_penalty=1.0,
+        no_repeat_ngram_size=3,
+    )
+    return [
+        tokenizer.decode(
+            tokenizer.convert_tokens_to_ids(res.hypotheses[0]),
+            skip_special_tokens=True,
+        )
+        for res in results
+    ]
+
+
+def _generate_hf(
+    tokenizer,
+    model,
+    chunks_text: list[str],
+    max_length: int,
+    min_length: int,
+    num_beams: int,
+) -> list[str]:
+    """Tüm parçaları padding ile tek bir ``model.generate`` çağrısında özetler."""
+    enc = tokenizer(
+        chunks_text,
+        return_tensors="pt",
+        padding=True,
+        truncation=True,
+        max_length=_MAX_INPUT_TOKENS,
+    )
+    # length_penalty / early_stopping yalnızca beam search'te geçerlidir;
+    # greedy'de verilirse transformers her çağrıda uyarı basar
+    beam_kwargs = (
+        {"length_penalty": 1.0, "early_stopping": True} if num_beams > 1 else {}
+    )
+    with torch.inference_mode():
+        output_ids = model.generate(
+            enc["input_ids"].to(model.device),
+            attention_mask=enc["attention_mask"].to(model.device),
+            max_length=max_length,
+            min_length=min_length,
+            num_beams=num_beams,
+            no_repeat_ngram_size=3,
+            use_cache=True,
+            **beam_kwargs,
+        )
+    return tokenizer.batch_decode(output_ids, skip_special_tokens=True)
 
 
 def abstractive_summarize(
     text: str,
     max_length: int = 150,
     min_length: int = 30,
+    num_beams: int = 2,
+    sentences: list[str] | None = None,
 ) -> list[str]:
     """mT5 tabanlı abstractive özetleme yapar.
 
@@ -121,6 +377,9 @@ def abstractive_summarize(
         text: Özetlenecek ham metin.
         max_length: Üretilecek özet için maksimum token sayısı.
         min_length: Üretilecek özet için minimum token sayısı.
+        num_beams: Beam search genişliği (1 = greedy).
+        sentences: Metnin önceden bölünmüş cümleleri. Verilmezse uzun
+            metinlerde ``tokenize_sentences`` ile hesaplanır.
 
     Returns:
         Üretilen özet cümlelerinin listesi.
@@ -143,42 +402,38 @@ def abstractive_summarize(
         chunks_text = [prefix + text]
     else:
         # Uzun metin — cümle bazlı parçala
-        sentences = tokenize_sentences(text)
+        # Her cümle yalnızca bir kez tokenize edilir, uzunluklar toplanır
+        if sentences is None:
+            sentences = tokenize_sentences(text)
+        sent_tok_lens = [
+            len(ids)
+            for ids in tokenizer(sentences, add_special_tokens=False)["input_ids"]
+        ]
+        prefix_len = len(tokenizer.encode(prefix, add_special_tokens=True))
+
         chunks_text = []
-        current_chunk = prefix
-        for sent in sentences:
-            candidate = current_chunk + " " + sent if current_chunk != prefix else prefix + sent
-            tok_len = len(tokenizer.encode(candidate, add_special_tokens=True))
-            if tok_len > _MAX_INPUT_TOKENS and current_chunk != prefix:
-                chunks_text.append(current_chunk)
-                current_chunk = prefix + sent
-            else:
-                current_chunk = candidate
-        if current_chunk and current_chunk != prefix:
-            chunks_text.append(current_chunk)
-
-    summaries = []
-    for chunk in chunks_text:
-        enc = tokenizer(
-            chunk,
-            return_tensors="pt",
-            max_length=_MAX_INPUT_TOKENS,
-            truncation=True,
+        cur_sents: list[str] = []
+        cur_len = prefix_len
+        for sent, tok_len in zip(sentences, sent_tok_lens):
+            if cur_len + tok_len > _MAX_INPUT_TOKENS and cur_sents:
+                chunks_text.append(prefix + " ".join(cur_sents))
+                cur_sents = []
+                cur_len = prefix_len
+            cur_sents.append(sent)
+            cur_len += tok_len
+        if cur_sents:
+            chunks_text.append(prefix + " ".join(cur_sents))
+
+    if ctranslate2 is not None and isinstance(model, ctranslate2.Translator):
+        decoded_chunks = _generate_ct2(
+            tokenizer, model, chunks_text, max_length, min_length, num_beams
         )
-        output_ids = model.generate(
-            enc["input_ids"],
-            max_length=max_length,
-            min_length=min_length,
-            num_beams=4,
-            length_penalty=1.0,
-            no_repeat_ngram_size=3,
-            early_stopping=True,
+    else:
+        decoded_chunks = _generate_hf(
+            tokenizer, model, chunks_text, max_length, min_length, num_beams
         )
-        decoded = tokenizer.decode(output_ids[0], skip_special_tokens=True)
-        if decoded.strip():
-            summaries.append(decoded.strip())
 
-    return summaries
+    return [d.strip() for d in decoded_chunks if d.strip()]
 
 
 # ── Özel Sezgisel Skorlama Algoritması ─────────────────────────────
@@ -293,7 +548,7 @@ def _length_penalty(word_count: int) -> float:
 
 def _compute_top_keywords(
     all_words: list[str],
-    stop_words: set[str],
+    stop_words: frozenset[str],
     top_n: int = 15,
 ) -> dict[str, float]:
     """Metin genelinde en sık geçen anlamlı kelimeleri bulur (kendi TF).
@@ -386,7 +641,7 @@ def custom_heuristic_summarize(
     W_LENGTH   = 0.10
 
     # ── Her cümleyi puanla ─────────────────────────────────────────
-    scores: list[tuple[int, float]] = []
+    scores = np.empty(total)
     for i, (orig, clean) in enumerate(zip(sentences, clean_sentences)):
         words = clean.split()
 
@@ -403,11 +658,10 @@ def custom_heuristic_summarize(
             + W_KEYWORD * s_keyword
             + W_LENGTH  * s_length
         )
-        scores.append((i, total_score))
+        scores[i] = total_score
 
     # En yüksek puanlı n cümleyi seç, orijinal sırayı koru
-    ranked = sorted(scores, key=lambda x: x[1], reverse=True)[:n]
-    selected_indices = sorted(idx for idx, _ in ranked)
+    selected_indices = _top_n_indices(scores, n)
 
     return [sentences[i] for i in selected_indices]
 
@@ -417,6 +671,7 @@ def summarize(
     n: int = 3,
     method: str = "textrank",
     title: str = "",
+    num_beams: int = 2,
 ) -> dict:
     """Metni seçilen yöntemle özetler.
 
@@ -425,6 +680,7 @@ def summarize(
         n: İstenen özet cümle sayısı (extractive yöntemler için).
         method: Özetleme yöntemi — "textrank", "tfidf", "custom" veya "abstractive".
         title: Haber başlığı (custom yöntemi için kullanılır).
+        num_beams: Beam search genişliği (abstractive yöntemi için).
 
     Returns:
         Şu anahtarları içeren dict:
@@ -469,15 +725,19 @@ def summarize(
         actual_n = min(n, len(sentences_filtered))
 
         if method == "abstractive":
-            selected = abstractive_summarize(text)
+            selected = abstractive_summarize(
+                text, num_beams=num_beams, sentences=sentences
+            )
         elif method == "custom":
             selected = custom_heuristic_summarize(
                 sentences_filtered, clean_filtered, actual_n, title=title
             )
-        elif method == "tfidf":
-            selected = tfidf_summarize(sentences_filtered, clean_filtered, actual_n)
         else:
-            selected = textrank_summarize(sentences_filtered, clean_filtered, actual_n)
+            tfidf_matrix = _fit_tfidf(clean_filtered)
+            if method == "tfidf":
+                selected = tfidf_summarize(sentences_filtered, tfidf_matrix, actual_n)
+            else:
+                selected = textrank_summarize(sentences_filtered, tfidf_matrix, actual_n)
 
         result["sentences"] = selected
         result["summary"] = " ".join(selected)